@@ -119,6 +119,70 @@ class Index:
         
         self.refs[obj.name][parent] = self.context[:] + [obj]
     
+    def lookup(self, name, context):
+    
+        """Returns the list of objects leading to the object with the given
+        name that is closest to the specified context, or None if the name is
+        unknown or no match can be found for the context."""
+        
+        try:
+            candidates = self.refs[name]
+        except KeyError:
+            return None
+        
+        if len(candidates) == 1:
+            return candidates.values()[0]
+        
+        # Find the match in the closest context to this one.
+        for level in context[::-1]:
+            try:
+                return candidates[level]
+            except KeyError:
+                pass
+        
+        return None
+    
+    def find(self, name, context):
+    
+        """Returns the list of objects leading to the object with the given
+        name that was defined directly in the specified context, or None if
+        no such object was indexed."""
+        
+        if context:
+            parent = context[-1]
+        else:
+            parent = None
+        
+        try:
+            return self.refs[name][parent]
+        except KeyError:
+            return None
+    
+    def find_object(self, obj, context):
+    
+        """Returns the list of objects leading to the object specified by obj
+        if it was indexed in the given context, or None if it was not."""
+        
+        pieces = self.find(obj.name, context)
+        if pieces is None or pieces[-1] != obj:
+            return None
+        
+        return pieces
+    
+    def get_module_name(self, module, context):
+    
+        """Returns the name of the documentation for the Module object
+        specified by module in the given context, or None if the module is
+        undocumented or is shadowed by another object in the index."""
+        
+        # Check that the matched object belonging to the parent of this
+        # module is the module object itself.
+        pieces = self.find(module.name, context)
+        if pieces is None or pieces[-1] != module.objects[0]:
+            return None
+        
+        return get_name(context + [module])
+    
     def process_body(self, obj):
     
         self.context.append(obj)
@@ -146,6 +210,40 @@ class Index:
                 ast.FunctionDef: handleFunctionDef}
 
 
+def get_name(objects):
+
+    """Returns the dotted name of the last object in the list of objects
+    given, ignoring any objects with empty names."""
+    
+    return ".".join(filter(lambda y: y != "", map(lambda x: x.name, objects)))
+
+def get_paragraphs(doc):
+
+    """Splits the docstring specified by doc into paragraphs, returning a list
+    of (indent, text) tuples where indent is the minimum indentation of the
+    lines in each paragraph."""
+    
+    lines = map(lambda line: line.rstrip(), doc.split("\n"))
+    paragraphs = []
+    para = []
+    
+    for line in lines:
+        if line:
+            l = line.lstrip()
+            para.append((len(line) - len(l), line))
+        elif para:
+            # Record the minimum indentation level with the text.
+            indent, para = zip(*para)
+            paragraphs.append((min(indent), "\n".join(para)))
+            para = []
+    
+    if para:
+        indent, para = zip(*para)
+        paragraphs.append((min(indent), "\n".join(para)))
+    
+    return paragraphs
+
+
 class Writer:
 
     """Writes the structure and documentation of Python source code to an
@@ -258,32 +356,21 @@ class Writer:
     
     def create_ref(self, obj):
     
-        """Returns the internal reference for the object specified by obj."""
+        """Returns the internal reference for the object specified by obj, or
+        an empty string if it was not indexed in the current context."""
         
-        pieces = self.index.refs[obj.name][self.context[-1]]
+        pieces = self.index.find_object(obj, self.context)
+        if pieces is None:
+            return ""
         
         return self.encode_ref(pieces)[1]
     
     def get_ref(self, name):
     
-        try:
-            candidates = self.index.refs[name]
-        except KeyError:
+        ref = self.index.lookup(name, self.context)
+        if ref is None:
             return ""
         
-        if len(candidates) == 1:
-            ref = candidates.values()[0]
-        else:
-            # Find the match in the closest context to this one.
-            for level in self.context[::-1]:
-                try:
-                    ref = candidates[level]
-                    break
-                except KeyError:
-                    pass
-            else:
-                return ""
-        
         href, ref = self.encode_ref(ref)
         if href:
             if ref:
@@ -322,22 +409,10 @@ class Writer:
     
     def write_module(self, module):
     
-        if self.context:
-            parent = self.context[-1]
-        else:
-            parent = None
-        
-        # Return if the matched object belonging to the parent of this module
-        # is not the same as the module object itself, or if no suitable object
-        # could be found.
-        try:
-            match = self.index.refs[module.name][parent][-1]
-            if match != module.objects[0]:
-                return
-        except KeyError:
+        name = self.index.get_module_name(module, self.context)
+        if name is None:
             return
         
-        name = ".".join(filter(lambda y: y != "", map(lambda x: x.name, self.context + [module])))
         self.open(name)
         self.write_objects(module.objects)
         self.close()
@@ -367,25 +442,7 @@ class Writer:
     
         doc = ast.get_docstring(obj)
         if doc:
-            lines = map(lambda line: line.rstrip(), doc.split("\n"))
-            paragraphs = []
-            para = []
-            
-            for line in lines:
-                if line:
-                    l = line.lstrip()
-                    para.append((len(line) - len(l), line))
-                else:
-                    # Record the minimum indentation level with the text.
-                    indent, para = zip(*para)
-                    paragraphs.append((min(indent), "\n".join(para)))
-                    para = []
-            
-            if para:
-                indent, para = zip(*para)
-                paragraphs.append((min(indent), "\n".join(para)))
-            
-            for indent, para in paragraphs:
+            for indent, para in get_paragraphs(doc):
             
                 # Treat indented text as preformatted text.
                 if indent > 0:
@@ -498,14 +555,23 @@ class Writer:
     def handleClassDef(self, obj):
     
         self.begin('div', attributes = {"class": "class"})
-        self.begin("h3", attributes = {"id": self.create_ref(obj),
-                                       "class": "class-heading"})
+        
+        # Objects defined inside functions are not indexed in this context.
+        attributes = {"class": "class-heading"}
+        ref = self.create_ref(obj)
+        if ref:
+            attributes["id"] = ref
+        
+        self.begin("h3", attributes = attributes)
         self.w(obj.name)
         
         if obj.bases:
         
             bases = []
             for base in obj.bases:
+                # Only simple names can be linked to objects in the index.
+                if not isinstance(base, ast.Name):
+                    continue
                 ref = self.get_ref(base.id)
                 if ref:
                     bases.append((base.id, ref))
@@ -531,8 +597,14 @@ class Writer:
     def handleFunctionDef(self, obj):
     
         self.begin('div class="function"')
-        self.begin("h3", attributes = {"id": self.create_ref(obj),
-                                       "class": "function-heading"})
+        
+        # Objects defined inside functions are not indexed in this context.
+        attributes = {"class": "function-heading"}
+        ref = self.create_ref(obj)
+        if ref:
+            attributes["id"] = ref
+        
+        self.begin("h3", attributes = attributes)
         self.w(obj.name)
         self.w("(")
         
@@ -594,6 +666,159 @@ class Writer:
                 ast.Num: handleNum,
                 ast.Str: handleStr}
 
+
+class Checker:
+
+    """Checks the references in docstrings against an index without writing
+    any HTML, recording any problems that a Writer would encounter.
+    """
+    
+    def __init__(self, index):
+    
+        self.index = index
+        
+        # Record problems as (location, message) tuples.
+        self.problems = []
+        
+        # Maintain a context stack that mirrors the one used by the Writer so
+        # that references are resolved in the same way.
+        self.context = []
+    
+    def location(self, obj = None):
+    
+        if obj is None:
+            return get_name(self.context)
+        else:
+            return get_name(self.context + [obj])
+    
+    def report(self, obj, message):
+    
+        self.problems.append((self.location(obj), message))
+    
+    def check_ref(self, obj, name, kind):
+    
+        """Reports a problem if the name used in the object specified by obj
+        is in the index but cannot be resolved in the current context.
+        
+        Names that are not in the index are not reported as unresolved because
+        they cannot be told apart from ordinary words in docstrings or from
+        base classes imported from other packages. The Writer leaves them
+        unlinked."""
+        
+        if name in self.index.refs and \
+           self.index.lookup(name, self.context) is None:
+            self.report(obj, "ambiguous %s: %s" % (kind, name))
+    
+    def check(self, obj):
+    
+        if isinstance(obj, Module):
+            self.check_module(obj)
+        elif isinstance(obj, Package):
+            self.check_package(obj)
+    
+    def check_module(self, module):
+    
+        # Skip the modules that the Writer skips, reporting those that are
+        # undocumented rather than shadowed by other objects in the index.
+        if self.index.get_module_name(module, self.context) is None:
+            if not self.index.is_documented(module.objects[0]):
+                self.report(module, "undocumented module")
+            return
+        
+        self.check_objects(module.objects)
+    
+    def check_package(self, package):
+    
+        self.context.append(package)
+        
+        for obj in package.objects:
+            self.check(obj)
+        
+        self.context.pop()
+    
+    def check_objects(self, objects):
+    
+        for obj in objects:
+        
+            # Do not visit certain types of object if they are undocumented.
+            if not self.index.is_documented(obj):
+                continue
+            
+            handler = Checker.Handlers.get(obj.__class__)
+            if handler:
+                handler(self, obj)
+    
+    def check_docstring(self, obj, names = set()):
+    
+        doc = ast.get_docstring(obj)
+        if not doc:
+            return
+        
+        for indent, para in get_paragraphs(doc):
+        
+            # Indented text is preformatted and not cross-referenced.
+            if indent > 0:
+                continue
+            
+            for piece in para.split():
+            
+                word = piece.rstrip(",.;:()")
+                
+                if word not in names and word != obj.name:
+                    self.check_ref(obj, word, "reference")
+    
+    def check_body(self, obj):
+    
+        self.context.append(obj)
+        
+        # Only check the types of object that the Writer includes in the body.
+        types = set(map(lambda x: x[0], Writer.Order[obj.__class__]))
+        self.check_objects(filter(lambda x: x.__class__ in types, obj.body))
+        
+        self.context.pop()
+    
+    def handleModule(self, obj):
+    
+        self.check_docstring(obj)
+        self.check_body(obj)
+    
+    def check_anchor(self, obj):
+    
+        """Reports a problem if the object specified by obj was not indexed in
+        the current context, so that the Writer cannot give it an anchor."""
+        
+        if self.index.find_object(obj, self.context) is None:
+            self.report(obj, "unanchored definition: %s" % obj.name)
+    
+    def handleClassDef(self, obj):
+    
+        self.check_anchor(obj)
+        
+        for base in obj.bases:
+            if isinstance(base, ast.Name):
+                self.check_ref(obj, base.id, "base class")
+        
+        self.check_docstring(obj)
+        self.check_body(obj)
+    
+    def handleFunctionDef(self, obj):
+    
+        self.check_anchor(obj)
+        
+        arg_names = set()
+        for name in obj.args.args:
+            if isinstance(name, ast.Name):
+                arg_names.add(name.id)
+        
+        self.check_docstring(obj, arg_names)
+        
+        # The Writer does not add functions to the context.
+        self.check_objects(obj.body)
+    
+    Handlers = {ast.ClassDef: handleClassDef,
+                ast.FunctionDef: handleFunctionDef,
+                ast.Module: handleModule}
+
 def find_modules(paths):
 
     trees = []
@@ -640,24 +865,49 @@ def process(paths, output_dir):
     for obj in trees:
         writer.write(obj)
 
+def check(paths):
+
+    """Checks the references in the docstrings of the modules found on each
+    path in the list of paths given without writing any documentation,
+    returning a list of (location, message) tuples describing any problems.
+    """
+    
+    index = Index()
+    trees = find_modules(paths)
+    
+    for obj in trees:
+        index.read(obj)
+    
+    # Create a checker that resolves references in the same way as a writer.
+    checker = Checker(index)
+    
+    for obj in trees:
+        checker.check(obj)
+    
+    return checker.problems
+
 
 def usage():
 
-    sys.stderr.write("Usage: %s [-o <output directory>] <Python module file or package directory> ...\n" % sys.argv[0])
+    sys.stderr.write("Usage: %s [--check] [-o <output directory>] <Python module file or package directory> ...\n" % sys.argv[0])
     sys.exit(1)
 
 if __name__ == "__main__":
 
+    # Only check references if requested, without writing any files.
+    args = filter(lambda arg: arg != "--check", sys.argv[1:])
+    check_only = len(args) != len(sys.argv) - 1
+    
     try:
-        at = sys.argv.index("-o")
-        output_dir = sys.argv[at + 1]
-        inputs = sys.argv[at + 2:]
-        if not os.path.exists(output_dir):
+        at = args.index("-o")
+        output_dir = args[at + 1]
+        inputs = args[at + 2:]
+        if not check_only and not os.path.exists(output_dir):
             os.mkdir(output_dir)
 
     except ValueError:
         output_dir = os.path.abspath(os.curdir)
-        inputs = sys.argv[1:]
+        inputs = args
     except IndexError:
         usage()
     except OSError:
@@ -667,6 +917,13 @@ if __name__ == "__main__":
     if not inputs:
         usage()
     
-    process(inputs, output_dir)
+    if check_only:
+        problems = check(inputs)
+        for location, message in problems:
+            sys.stderr.write("%s: %s\n" % (location, message))
+        if problems:
+            sys.exit(1)
+    else:
+        process(inputs, output_dir)
     
     sys.exit()